@@ -6,19 +6,23 @@ import sys
 import logging
 import uuid
 import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from tqdm import tqdm
 from modules.config_loader import load_config
 from modules.db_connector import OracleDBConnector
-from modules.batch_fetcher import fetch_data_batchwise
+from modules.batch_fetcher import fetch_data_batchwise, estimate_row_count, count_rows, fetch_column_types, fetch_db_time
 from modules.row_hasher import hash_rows
-from modules.comparator import compare_hashes
+from modules.comparator import compare_hashes, compare_row_sets
 from modules.sql_generator import generate_sql_file
 from modules.audit_logger import log_to_audit_table, log_event, log_batch_event, log_error_event
 from modules.checkpoint_manager import save_batch_checkpoint, load_batch_checkpoint
 from modules.reverifier import verify_primary_keys
+from modules.sampler import build_sample_filter, combine_where, effective_sample_percent, estimate_drift
+from modules.watcher import compare_changed_rows, carry_forward
+from modules.mismatch_writer import MismatchWriter
 import time
 import csv
+import argparse
 
 def setup_logging(audit_log_path, debug=False):
     os.makedirs(os.path.dirname(audit_log_path), exist_ok=True)
@@ -31,6 +35,15 @@ def setup_logging(audit_log_path, debug=False):
     logging.getLogger().addHandler(logging.StreamHandler(sys.stdout))
 
 
+def count_rows_on_connector(count_db, schema, table, where_clause=None):
+    """
+    Runs the exact row count on its own connection so it does not block batch fetches on the shared one.
+    count_db is an unopened OracleDBConnector; the caller keeps it so it can cancel a count still running.
+    """
+    with count_db as db:
+        return count_rows(db.conn, schema, table, where_clause)
+
+
 def process_table(table_cfg, config, source_db, target_db, job_id, run_id, ui_progress_hook=None):
     schema = table_cfg['schema']
     table = table_cfg['table_name']
@@ -44,24 +57,40 @@ def process_table(table_cfg, config, source_db, target_db, job_id, run_id, ui_pr
     enable_audit = config['flags'].get('enable_audit_table', False)
     enable_restart = config['flags'].get('enable_restart', False)
     enable_reverification = config['flags'].get('enable_reverification', False)
+    enable_exact_count = config['flags'].get('enable_exact_count', False)
+    enable_columnar_output = config['flags'].get('enable_columnar_output', False)
+    columnar_include_values = config['flags'].get('columnar_include_values', False)
     debug = config.get('flags', {}).get('debug', False)
+    sampling_cfg = config.get('sampling', {})
+    sample_percent = table_cfg.get('sample_percent', sampling_cfg.get('sample_percent', 1.0))
+    enable_sampling = config['flags'].get('enable_sampling', False) or 'sample_percent' in table_cfg
+    if enable_sampling:
+        # Both sides select the same PK-hash buckets, so the sample is reproducible and aligned
+        requested_percent = sample_percent
+        sample_percent = effective_sample_percent(sample_percent)
+        if sample_percent != requested_percent:
+            log_event(f"Sample percent for {schema}.{table} rounded from {requested_percent}% to {sample_percent}% (ORA_HASH bucket size)")
+        pk_types = fetch_column_types(source_db.conn, schema, table, primary_keys)
+        sample_filter = build_sample_filter(primary_keys, sample_percent, sampling_cfg.get('seed', 0), pk_types)
+        where_clause = combine_where(where_clause, sample_filter)
+        log_event(f"Sampling {sample_percent}% of {schema}.{table} by PK hash (seed={sampling_cfg.get('seed', 0)})")
 
     # Timestamped per-table SQL output files
     output_dir = './output'
     os.makedirs(output_dir, exist_ok=True)
     source_sql_path = os.path.join(output_dir, f'source_{table}_sync_{run_id}.sql')
     target_sql_path = os.path.join(output_dir, f'target_{table}_sync_{run_id}.sql')
+    mismatch_writer = None
+    count_executor = None
+    count_db = None
 
     try:
-        # 1. Get total row count for progress
-        with source_db.get_cursor() as cur:
-            count_sql = f"SELECT COUNT(1) FROM {schema}.{table}"
-            if where_clause:
-                count_sql += f" WHERE {where_clause}"
-            if debug:
-                log_event(f"Count SQL: {count_sql}", level='debug')
-            cur.execute(count_sql)
-            total_rows = cur.fetchone()[0]
+        # 1. Estimate row count for progress from optimizer stats (no table scan)
+        total_rows = estimate_row_count(source_db.conn, schema, table)
+        if total_rows is not None and enable_sampling:
+            total_rows = int(total_rows * sample_percent / 100.0)
+        if debug:
+            log_event(f"Estimated rows for {schema}.{table}: {total_rows}", level='debug')
 
         # 2. Determine columns to use
         if not columns:
@@ -75,83 +104,142 @@ def process_table(table_cfg, config, source_db, target_db, job_id, run_id, ui_pr
         offset = 0
         batch_id_start = 0
         if enable_restart:
-            # Find the last completed batch for this job/table
+            # Find the last batch of the contiguous completed prefix for this job/table
             last_batch = 0
-            for i in range((total_rows + batch_size - 1) // batch_size):
-                checkpoint = load_batch_checkpoint(source_db.conn, metadata_table, job_id, table, schema, i)
-                if checkpoint and checkpoint.get('status') == 'COMPLETED':
-                    last_batch = i + 1
+            while True:
+                checkpoint = load_batch_checkpoint(source_db.conn, metadata_table, job_id, table, schema, last_batch)
+                if not checkpoint or checkpoint.get('status') != 'COMPLETED':
+                    break
+                last_batch += 1
             offset = last_batch * batch_size
             batch_id_start = last_batch
             if last_batch > 0:
                 log_event(f"Resuming {schema}.{table} from batch {last_batch} (offset {offset})")
 
+        # Columnar mismatch file (Parquet, or gzip JSON lines without pyarrow), written after reverification
+        if enable_columnar_output:
+            mismatch_writer = MismatchWriter(
+                os.path.join(output_dir, f'mismatches_{table}_{run_id}'), columns, primary_keys,
+                exclude_columns, include_values=columnar_include_values
+            )
+
         # 4. Batch processing with threading and tqdm
+        # Batches are scheduled until both sides return a short batch, so no upfront COUNT is needed.
         max_threads = config.get('max_threads', 4)  # Configurable number of threads
-        n_batches = (total_rows - offset + batch_size - 1) // batch_size
+        n_batches = max(1, (total_rows - offset + batch_size - 1) // batch_size) if total_rows else None
         mismatches = []
         missing_in_source = []
         missing_in_target = []
         source_rows = {}
         target_rows = {}
+        fetched_source_rows = 0
+        scan_complete = True
+        consecutive_errors = 0
+        max_batch_errors = config.get('max_consecutive_batch_errors', 3)
         start_time = time.time()
+        count_future = None
+        if enable_exact_count:
+            # Exact count runs alongside the comparison and only refines the progress bar
+            count_executor = ThreadPoolExecutor(max_workers=1)
+            # Use a dedicated connection: oracledb runs one call per connection at a time
+            count_db = OracleDBConnector(config['source_db'])
+            count_future = count_executor.submit(count_rows_on_connector, count_db, schema, table, where_clause)
         log_event(f"Using multithreading with max_threads={max_threads} for batch execution.")
-        with ThreadPoolExecutor(max_workers=max_threads) as executor:
+        with ThreadPoolExecutor(max_workers=max_threads) as executor, tqdm(total=n_batches, desc=f"Comparing {schema}.{table}") as pbar:
             futures = {}
-            for i in range(n_batches):
-                batch_offset = offset + i * batch_size
-                batch_id = batch_id_start + i
-                if debug:
-                    log_event(f"Submitting batch {batch_id} (offset={batch_offset}, size={batch_size}) for {schema}.{table}", level='debug')
-                futures[executor.submit(
-                    process_batch, source_db, target_db, schema, table, columns, primary_keys, where_clause, batch_size, batch_offset, exclude_columns, source_rows, target_rows, batch_id
-                )] = batch_id
-            for f in tqdm(as_completed(futures), total=n_batches, desc=f"Comparing {schema}.{table}"):
-                batch_id = futures[f]
-                try:
-                    batch_result = f.result()
+            next_batch = 0
+            end_reached = False
+            while futures or not end_reached:
+                # Keep a bounded window of batches in flight
+                while not end_reached and len(futures) < max_threads * 2:
+                    batch_offset = offset + next_batch * batch_size
+                    batch_id = batch_id_start + next_batch
                     if debug:
-                        log_event(f"Batch {batch_id} result: {batch_result}", level='debug')
-                    mismatches.extend(batch_result['mismatches'])
-                    missing_in_source.extend(batch_result['missing_in_source'])
-                    missing_in_target.extend(batch_result['missing_in_target'])
-                    # Save checkpoint after each batch
-                    if enable_restart:
-                        save_batch_checkpoint(source_db.conn, metadata_table, {
-                            'job_id': job_id,
-                            'table_name': table,
-                            'schema_name': schema,
-                            'batch_id': batch_id,
-                            'last_offset': batch_result['offset'] + batch_size,
-                            'processed_rows': batch_result['processed_rows'],
-                            'total_rows': total_rows,
-                            'status': 'COMPLETED',
-                            'error_message': None,
-                            'last_processed_time': time.strftime('%Y-%m-%d %H:%M:%S')
-                        })
-                    if enable_audit:
-                        log_batch_event(source_db.conn, audit_table, job_id, table, schema, batch_id, batch_result['processed_rows'], len(batch_result['mismatches']), 'COMPLETED')
+                        log_event(f"Submitting batch {batch_id} (offset={batch_offset}, size={batch_size}) for {schema}.{table}", level='debug')
+                    futures[executor.submit(
+                        process_batch, source_db, target_db, schema, table, columns, primary_keys, where_clause, batch_size, batch_offset, exclude_columns, source_rows, target_rows, batch_id
+                    )] = (batch_id, batch_offset)
+                    next_batch += 1
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for f in done:
+                    batch_id, batch_offset = futures.pop(f)
+                    try:
+                        batch_result = f.result()
+                        if debug:
+                            log_event(f"Batch {batch_id} result: {batch_result}", level='debug')
+                        # A short batch on both sides marks the end of the key range
+                        if batch_result['processed_rows'] < batch_size and batch_result['processed_target_rows'] < batch_size:
+                            end_reached = True
+                        fetched_source_rows += batch_result['processed_rows']
+                        consecutive_errors = 0
+                        mismatches.extend(batch_result['mismatches'])
+                        missing_in_source.extend(batch_result['missing_in_source'])
+                        missing_in_target.extend(batch_result['missing_in_target'])
+                        # Save checkpoint after each batch
+                        if enable_restart:
+                            save_batch_checkpoint(source_db.conn, metadata_table, {
+                                'job_id': job_id,
+                                'table_name': table,
+                                'schema_name': schema,
+                                'batch_id': batch_id,
+                                'last_offset': batch_result['offset'] + batch_size,
+                                'processed_rows': batch_result['processed_rows'],
+                                'total_rows': total_rows,
+                                'status': 'COMPLETED',
+                                'error_message': None,
+                                'last_processed_time': time.strftime('%Y-%m-%d %H:%M:%S')
+                            })
+                        if enable_audit:
+                            log_batch_event(source_db.conn, audit_table, job_id, table, schema, batch_id, batch_result['processed_rows'], len(batch_result['mismatches']), 'COMPLETED')
+                    except Exception as e:
+                        import traceback
+                        log_event(f"Exception in batch {batch_id}: {e}\n{traceback.format_exc()}", level='debug')
+                        if enable_restart:
+                            save_batch_checkpoint(source_db.conn, metadata_table, {
+                                'job_id': job_id,
+                                'table_name': table,
+                                'schema_name': schema,
+                                'batch_id': batch_id,
+                                'last_offset': batch_offset,
+                                'processed_rows': 0,
+                                'total_rows': total_rows,
+                                'status': 'ERROR',
+                                'error_message': str(e),
+                                'last_processed_time': time.strftime('%Y-%m-%d %H:%M:%S')
+                            })
+                        if enable_audit:
+                            log_error_event(source_db.conn, audit_table, job_id, table, schema, batch_id, str(e))
+                        log_event(f"Error in batch {batch_id} of {schema}.{table}: {e}")
+                        scan_complete = False
+                        consecutive_errors += 1
+                        # Later batches still detect the end of the table; only give up if the source looks unusable
+                        if consecutive_errors >= max_batch_errors and not end_reached:
+                            log_event(f"Stopping batch scheduling for {schema}.{table} after {consecutive_errors} consecutive batch errors")
+                            end_reached = True
+                    # Refine the progress bar: exact count if it has arrived, otherwise grow past a low estimate
+                    if count_future is not None and count_future.done() and not count_future.exception():
+                        total_rows = count_future.result()
+                        pbar.total = max(1, (total_rows - offset + batch_size - 1) // batch_size)
+                    pbar.update(1)
+                    if pbar.total is None or pbar.n >= pbar.total:
+                        pbar.total = pbar.n + len(futures)
+                    pbar.refresh()
+                    n_batches = pbar.total
                     if ui_progress_hook:
                         ui_progress_hook(table, batch_id, n_batches)
-                except Exception as e:
-                    import traceback
-                    log_event(f"Exception in batch {batch_id}: {e}\n{traceback.format_exc()}", level='debug')
-                    if enable_restart:
-                        save_batch_checkpoint(source_db.conn, metadata_table, {
-                            'job_id': job_id,
-                            'table_name': table,
-                            'schema_name': schema,
-                            'batch_id': batch_id,
-                            'last_offset': batch_offset,
-                            'processed_rows': 0,
-                            'total_rows': total_rows,
-                            'status': 'ERROR',
-                            'error_message': str(e),
-                            'last_processed_time': time.strftime('%Y-%m-%d %H:%M:%S')
-                        })
-                    if enable_audit:
-                        log_error_event(source_db.conn, audit_table, job_id, table, schema, batch_id, str(e))
-                    log_event(f"Error in batch {batch_id} of {schema}.{table}: {e}")
+            pbar.total = pbar.n
+            pbar.refresh()
+
+        # Exact row count: from the concurrent COUNT if it already finished, otherwise derived from the comparison.
+        # Never wait for the COUNT here; a still-running one is cancelled in the finally block.
+        if count_future is not None and count_future.done() and not count_future.cancelled() and not count_future.exception():
+            total_rows = count_future.result()
+        elif scan_complete:
+            total_rows = offset + fetched_source_rows
+        elif debug:
+            log_event(f"Row count for {schema}.{table} remains an estimate: some batches failed", level='debug')
+        if count_future is not None and count_future.done() and not count_future.cancelled() and count_future.exception():
+            log_event(f"Background row count failed for {schema}.{table}: {count_future.exception()}")
         end_time = time.time()
 
         # Debug: show sample PKs and counts after comparison
@@ -160,11 +248,25 @@ def process_table(table_cfg, config, source_db, target_db, job_id, run_id, ui_pr
             log_event(f"Total missing_in_source: {len(missing_in_source)}, sample: {list(missing_in_source)[:5]}", level='debug')
             log_event(f"Total missing_in_target: {len(missing_in_target)}, sample: {list(missing_in_target)[:5]}", level='debug')
 
+        # 6. Drift estimate for sampling mode
+        drift_estimate = {}
+        if enable_sampling:
+            # Replace the per-batch lists so the report counts, status and estimate all come from one comparison
+            mismatches, missing_in_source, missing_in_target = compare_row_sets(source_rows, target_rows, columns, exclude_columns)
+            sampled_keys = len(set(source_rows) | set(target_rows))
+            drifted_keys = len(mismatches) + len(missing_in_source) + len(missing_in_target)
+            drift_estimate = estimate_drift(sampled_keys, drifted_keys, sampling_cfg.get('confidence', 0.95))
+            log_event(
+                f"Sample estimate for {schema}.{table}: drift rate {drift_estimate['estimated_drift_rate']:.6%} "
+                f"({drift_estimate['confidence']:.0%} CI {drift_estimate['drift_ci_low']:.6%} - {drift_estimate['drift_ci_high']:.6%}) "
+                f"over {sampled_keys} sampled keys"
+            )
+
         # 7. Reverification step
         safe_to_insert = set(missing_in_target)
         valid_update_pks = set(mismatches)
         no_op_update_pks = set()
-        if enable_reverification:
+        if enable_reverification and not enable_sampling:
             # Debug log PKs to verify for INSERT
             log_event(f"PKs to verify for INSERT: {missing_in_target}", level='debug')
             safe_to_insert = verify_primary_keys(target_db.conn, f"{schema}.{table}", primary_keys, missing_in_target, max_threads=max_threads)
@@ -178,31 +280,68 @@ def process_table(table_cfg, config, source_db, target_db, job_id, run_id, ui_pr
                 log_event(f"No-op UPDATE PKs (not present in target): {no_op_update_pks}", level='debug')
                 log_event(f"No-op UPDATE count: {len(no_op_update_pks)}", level='debug')
 
+        # Columnar mismatch file: whole-table comparison, with MISSING_IN_TARGET limited to reverified PKs
+        if mismatch_writer:
+            if enable_sampling:
+                file_drift = (mismatches, missing_in_source, missing_in_target)
+            else:
+                file_drift = compare_row_sets(source_rows, target_rows, columns, exclude_columns)
+            file_mismatches, file_missing_in_source, file_missing_in_target = file_drift
+            if enable_reverification and not enable_sampling:
+                file_missing_in_target = [pk for pk in file_missing_in_target if pk in safe_to_insert]
+            mismatch_writer.write_all(
+                file_mismatches, file_missing_in_source, file_missing_in_target,
+                source_rows, target_rows, chunk_size=batch_size
+            )
+
         # 8. Final report
         log_event(f"Table {schema}.{table} compared. Mismatches: {len(mismatches)}, Missing in source: {len(missing_in_source)}, Missing in target: {len(missing_in_target)}")
+        if mismatch_writer and mismatch_writer.rows_written:
+            log_event(f"Wrote {mismatch_writer.rows_written} mismatch records for {schema}.{table} to {mismatch_writer.path}")
 
         # 5. Generate SQL files (per-table, per-run) with verified PKs
-        if debug:
-            log_event(f"Generating SQL for {schema}.{table}: {len(valid_update_pks)} UPDATEs, {len(safe_to_insert)} INSERTs", level='debug')
-        generate_sql_file(
-            valid_update_pks,  # Only verified PKs for UPDATE
-            missing_in_source,
-            safe_to_insert,    # Only safe PKs for INSERT
-            columns,
-            source_rows,
-            target_rows,
-            primary_keys,
-            source_sql_path,
-            target_sql_path,
-            table_name=f"{schema}.{table}"
-        )
+        # Sampling mode is a quick drift check only; sync SQL needs a full comparison
+        if enable_sampling:
+            source_sql_path = target_sql_path = ''
+        else:
+            if debug:
+                log_event(f"Generating SQL for {schema}.{table}: {len(valid_update_pks)} UPDATEs, {len(safe_to_insert)} INSERTs", level='debug')
+            generate_sql_file(
+                valid_update_pks,  # Only verified PKs for UPDATE
+                missing_in_source,
+                safe_to_insert,    # Only safe PKs for INSERT
+                columns,
+                source_rows,
+                target_rows,
+                primary_keys,
+                source_sql_path,
+                target_sql_path,
+                table_name=f"{schema}.{table}"
+            )
     except Exception as e:
         import traceback
         log_event(f"Exception in process_table for {schema}.{table}: {e}\n{traceback.format_exc()}", level='debug')
         raise
+    finally:
+        if mismatch_writer:
+            mismatch_writer.close()
+        if count_executor:
+            # The comparison no longer needs the COUNT; interrupt it rather than waiting for the full scan
+            if count_db is not None and count_db.conn is not None and not count_future.done():
+                try:
+                    count_db.conn.cancel()
+                except Exception as e:
+                    log_event(f"Could not cancel background row count for {schema}.{table}: {e}", level='debug')
+            count_executor.shutdown(wait=False, cancel_futures=True)
 
     # Return summary for comparison report
-    return {
+    if not scan_complete:
+        status = 'INCOMPLETE'
+    else:
+        status = 'COMPLETED' if not mismatches else 'MISMATCH'
+        if enable_sampling and (missing_in_source or missing_in_target):
+            status = 'MISMATCH'
+    summary = {
         'job_id': job_id,
         'table_name': table,
         'schema': schema,
@@ -210,13 +349,17 @@ def process_table(table_cfg, config, source_db, target_db, job_id, run_id, ui_pr
         'mismatch_count': len(mismatches),
         'missing_in_source': len(missing_in_source),
         'missing_in_target': len(missing_in_target),
-        'status': 'COMPLETED' if not mismatches else 'MISMATCH',
+        'status': status,
         'start_time': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(start_time)),
         'end_time': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(end_time)),
         'source_sql_file': os.path.basename(source_sql_path),
         'target_sql_file': os.path.basename(target_sql_path),
         'no_op_update_count': len(no_op_update_pks),
+        'sample_percent': sample_percent if enable_sampling else None,
+        'mismatch_file': os.path.basename(mismatch_writer.path) if mismatch_writer and mismatch_writer.rows_written else '',
     }
+    summary.update(drift_estimate)
+    return summary
 
 
 def process_batch(source_db, target_db, schema, table, columns, primary_keys, where_clause, batch_size, offset, exclude_columns, source_rows, target_rows, batch_id):
@@ -227,8 +370,8 @@ def process_batch(source_db, target_db, schema, table, columns, primary_keys, wh
     # Debug: log number of rows fetched
     log_event(f"Batch {batch_id} fetched {len(src_rows)} source rows, {len(tgt_rows)} target rows for {schema}.{table}", level='debug')
     # Hash rows
-    src_hashes = hash_rows(src_rows, col_names, exclude_columns)
-    tgt_hashes = hash_rows(tgt_rows, col_names, exclude_columns)
+    src_hashes = hash_rows(src_rows, col_names, exclude_columns, primary_keys)
+    tgt_hashes = hash_rows(tgt_rows, col_names, exclude_columns, primary_keys)
     # Debug: log sample hashes
     log_event(f"Batch {batch_id} sample source hashes: {list(src_hashes.items())[:3]}", level='debug')
     log_event(f"Batch {batch_id} sample target hashes: {list(tgt_hashes.items())[:3]}", level='debug')
@@ -248,11 +391,126 @@ def process_batch(source_db, target_db, schema, table, columns, primary_keys, wh
         'missing_in_source': missing_in_source,
         'missing_in_target': missing_in_target,
         'offset': offset,
-        'processed_rows': len(src_rows)
+        'processed_rows': len(src_rows),
+        'processed_target_rows': len(tgt_rows)
     }
 
 
-def main(ui_progress_hook=None):
+def watch_tables(config, source_db, target_db, job_id, run_id):
+    """
+    Long-running watch mode: every cycle compares only rows changed since the table's last successful cycle,
+    re-checking drifted PKs from the previous cycle so in-flight replication is not reported.
+    Reuses the open connections and the loaded config for every cycle.
+    """
+    watch_cfg = config.get('watch', {})
+    interval = watch_cfg.get('interval_seconds', 300)
+    window_seconds = watch_cfg.get('window_seconds', interval * 2)  # Lookback for a table's first cycle
+    overlap_seconds = watch_cfg.get('overlap_seconds', 60)  # Re-read before the previous mark to cover in-flight commits
+    confirm_cycles = watch_cfg.get('confirm_cycles', 2)
+    max_cycles = watch_cfg.get('max_cycles', 0)  # 0 = run until interrupted
+    audit_table = config['paths'].get('audit_table', 'DB_SENTINEL_AUDIT')
+    enable_audit = config['flags'].get('enable_audit_table', False)
+    debug = config.get('flags', {}).get('debug', False)
+
+    os.makedirs('./output', exist_ok=True)
+    report_path = f"./output/watch_report_{run_id}.csv"
+    fieldnames = ['job_id', 'cycle', 'table_name', 'schema', 'checked_keys', 'drifted_keys',
+                  'new_drift', 'pending_drift', 'confirmed_drift', 'resolved', 'status', 'cycle_time', 'elapsed_seconds']
+    with open(report_path, 'w', newline='') as f:
+        csv.DictWriter(f, fieldnames=fieldnames).writeheader()
+
+    # Per-table state carried across cycles
+    table_columns = {}
+    pending = {(tbl['schema'], tbl['table_name']): {} for tbl in config['table_config']}
+    reported = {(tbl['schema'], tbl['table_name']): set() for tbl in config['table_config']}
+    # Low-water marks: (source, target) DB time at the start of each table's last successful cycle
+    marks = {}
+    log_event(f"Watch mode started: interval={interval}s, initial window={window_seconds}s, overlap={overlap_seconds}s, confirm_cycles={confirm_cycles}")
+
+    cycle = 0
+    try:
+        while not max_cycles or cycle < max_cycles:
+            cycle_start = time.time()
+            cycle_results = []
+            for table_cfg in config['table_config']:
+                schema = table_cfg['schema']
+                table = table_cfg['table_name']
+                key = (schema, table)
+                try:
+                    if key not in table_columns:
+                        columns = table_cfg.get('columns')
+                        if not columns:
+                            with source_db.get_cursor() as cur:
+                                cur.execute(f"SELECT * FROM {schema}.{table} WHERE 1=0")
+                                columns = [desc[0] for desc in cur.description]
+                        table_columns[key] = columns
+                    table_start = time.time()
+                    cycle_marks = (fetch_db_time(source_db.conn), fetch_db_time(target_db.conn))
+                    if key in marks:
+                        since = tuple(mark - datetime.timedelta(seconds=overlap_seconds) for mark in marks[key])
+                    else:
+                        since = tuple(now - datetime.timedelta(seconds=window_seconds) for now in cycle_marks)
+                    if debug:
+                        log_event(f"Watch cycle {cycle} {schema}.{table}: changes since source={since[0]}, target={since[1]}", level='debug')
+                    checked_pks, drift = compare_changed_rows(
+                        source_db, target_db, table_cfg, table_columns[key], since, pending[key]
+                    )
+                    pending[key], reported[key], confirmed, resolved = carry_forward(
+                        pending[key], reported[key], drift, checked_pks, confirm_cycles
+                    )
+                    # Only advance the mark once this table's cycle succeeded, so failed cycles are re-read
+                    marks[key] = cycle_marks
+                    pending_drift = len(pending[key])
+                    # First seen this cycle: pending PKs whose consecutive-drift count is 1
+                    new_drift = sum(1 for seen in pending[key].values() if seen == 1)
+                    status = 'MISMATCH' if confirmed else 'COMPLETED'
+                    log_event(
+                        f"Watch cycle {cycle} {schema}.{table}: checked {len(checked_pks)}, drifted {len(drift)} "
+                        f"({len(confirmed)} confirmed, {pending_drift} pending re-check, {new_drift} new), resolved {len(resolved)}"
+                    )
+                    if confirmed:
+                        log_event(f"Confirmed drift in {schema}.{table}, sample: {list(confirmed.items())[:5]}")
+                    if debug:
+                        log_event(f"Pending PKs for {schema}.{table}: {list(pending[key])[:20]}", level='debug')
+                    if enable_audit:
+                        log_batch_event(
+                            source_db.conn, audit_table, job_id, table, schema, cycle, len(checked_pks), len(confirmed), status,
+                            details=f"drifted={len(drift)} new={new_drift} pending={pending_drift} resolved={len(resolved)}", event_type='WATCH'
+                        )
+                    cycle_results.append({
+                        'job_id': job_id,
+                        'cycle': cycle,
+                        'table_name': table,
+                        'schema': schema,
+                        'checked_keys': len(checked_pks),
+                        'drifted_keys': len(drift),
+                        'new_drift': new_drift,
+                        'pending_drift': pending_drift,
+                        'confirmed_drift': len(confirmed),
+                        'resolved': len(resolved),
+                        'status': status,
+                        'cycle_time': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(table_start)),
+                        'elapsed_seconds': round(time.time() - table_start, 3),
+                    })
+                except Exception as e:
+                    # Keep watching other tables and later cycles; pending state and low-water mark are left untouched
+                    import traceback
+                    log_event(f"Exception in watch cycle {cycle} for {schema}.{table}: {e}\n{traceback.format_exc()}", level='debug')
+                    if enable_audit:
+                        log_error_event(source_db.conn, audit_table, job_id, table, schema, cycle, str(e))
+                    log_event(f"Error in watch cycle {cycle} of {schema}.{table}: {e}")
+            with open(report_path, 'a', newline='') as f:
+                csv.DictWriter(f, fieldnames=fieldnames).writerows(cycle_results)
+            cycle += 1
+            if max_cycles and cycle >= max_cycles:
+                break
+            time.sleep(max(0, interval - (time.time() - cycle_start)))
+    except KeyboardInterrupt:
+        log_event("Watch mode interrupted.")
+    log_event(f"Watch mode stopped after {cycle} cycles. Report: {report_path}")
+
+
+def main(ui_progress_hook=None, watch=False):
     # 1. Load config
     config = load_config('config.yaml')
     debug = config.get('flags', {}).get('debug', False)
@@ -271,6 +529,11 @@ def main(ui_progress_hook=None):
     # 4. Connect to source and target DBs
     comparison_results = []
     with OracleDBConnector(config['source_db']) as source_db, OracleDBConnector(config['target_db']) as target_db:
+        if watch:
+            # Watch mode keeps these connections open and writes its own per-cycle report
+            watch_tables(config, source_db, target_db, job_id, run_id)
+            log_event(f"DB_Sentinel_util_super completed. Job ID: {job_id}")
+            return
         # 5. For each table in config, orchestrate comparison
         for table_cfg in config['table_config']:
             result = process_table(table_cfg, config, source_db, target_db, job_id, run_id, ui_progress_hook)
@@ -279,8 +542,10 @@ def main(ui_progress_hook=None):
     # 6. Write comparison report as CSV (timestamped)
     report_path = f"./output/comparison_report_{run_id}.csv"
     if comparison_results:
+        # Sampled tables carry extra drift-estimate columns, so use the union of all keys
+        fieldnames = list(dict.fromkeys(k for result in comparison_results for k in result))
         with open(report_path, 'w', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=comparison_results[0].keys())
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
             writer.writeheader()
             writer.writerows(comparison_results)
         log_event(f"Comparison report written to {report_path}")
@@ -290,4 +555,7 @@ def main(ui_progress_hook=None):
     log_event(f"DB_Sentinel_util_super completed. Job ID: {job_id}")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="DB_Sentinel_util_super: Oracle table comparison and sync utility.")
+    parser.add_argument('--watch', action='store_true', help="Continuously re-compare recently changed rows (see 'watch' in config.yaml).")
+    args = parser.parse_args()
+    main(watch=args.watch) 
\ No newline at end of file
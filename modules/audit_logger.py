@@ -17,12 +17,12 @@ def log_to_audit_table(conn, audit_table, event_data):
     cur.close()
     logging.info(f"Logged to audit table: {event_data}")
 
-def log_batch_event(conn, audit_table, job_id, table, schema, batch_id, row_counts, mismatch_count, status, details=None):
+def log_batch_event(conn, audit_table, job_id, table, schema, batch_id, row_counts, mismatch_count, status, details=None, event_type='BATCH'):
     event_data = {
         'job_id': job_id,
         'user_name': getpass.getuser(),
         'event_time': time.strftime('%Y-%m-%d %H:%M:%S'),
-        'event_type': 'BATCH',
+        'event_type': event_type,
         'table_name': table,
         'schema_name': schema,
         'batch_id': batch_id,
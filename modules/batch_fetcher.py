@@ -15,4 +15,112 @@ def fetch_data_batchwise(conn, schema, table, columns, primary_keys, where_claus
     rows = cur.fetchall()
     col_names = [desc[0] for desc in cur.description]
     cur.close()
-    return rows, col_names 
\ No newline at end of file
+    return rows, col_names 
+
+def estimate_row_count(conn, schema, table):
+    """
+    Returns the optimizer's row estimate for a table from ALL_TABLES.NUM_ROWS,
+    falling back to the sum of partition stats. Returns None if the table has no statistics.
+    This is a dictionary lookup, so it does not scan the table.
+    """
+    cur = conn.cursor()
+    sql = (
+        "SELECT NVL(t.num_rows, (SELECT SUM(p.num_rows) FROM all_tab_partitions p "
+        "WHERE p.table_owner = t.owner AND p.table_name = t.table_name)) "
+        "FROM all_tables t WHERE t.owner = :owner AND t.table_name = :table_name"
+    )
+    cur.execute(sql, {'owner': schema.upper(), 'table_name': table.upper()})
+    row = cur.fetchone()
+    cur.close()
+    if row and row[0] is not None:
+        return int(row[0])
+    return None
+
+
+def count_rows(conn, schema, table, where_clause=None):
+    """
+    Returns the exact row count for a table (full scan). Intended to run concurrently with batch fetching.
+    """
+    cur = conn.cursor()
+    sql = f"SELECT COUNT(1) FROM {schema}.{table}"
+    if where_clause:
+        sql += f" WHERE {where_clause}"
+    cur.execute(sql)
+    total = cur.fetchone()[0]
+    cur.close()
+    return total
+
+
+def fetch_db_time(conn):
+    """
+    Returns the database server's current local time as a naive datetime (CAST(SYSTIMESTAMP AS TIMESTAMP)).
+    """
+    cur = conn.cursor()
+    cur.execute("SELECT CAST(SYSTIMESTAMP AS TIMESTAMP) FROM dual")
+    now = cur.fetchone()[0]
+    cur.close()
+    return now
+
+
+def fetch_changed_keys(conn, schema, table, primary_keys, where_clause, since, watermark_column=None):
+    """
+    Returns the PK tuples of rows changed at or after since, a server-local time as returned by fetch_db_time.
+    Uses watermark_column if given, otherwise ORA_ROWSCN (block-level unless the table has ROWDEPENDENCIES,
+    so it may over-select, which is harmless for comparison).
+    """
+    cur = conn.cursor()
+    pk_cols = ', '.join(primary_keys)
+    # since is server-local time without a zone, matching columns filled from SYSDATE/SYSTIMESTAMP
+    if watermark_column:
+        window_pred = f"{watermark_column} >= CAST(:since AS TIMESTAMP)"
+    else:
+        window_pred = "ORA_ROWSCN >= TIMESTAMP_TO_SCN(CAST(:since AS TIMESTAMP))"
+    sql = f"SELECT {pk_cols} FROM {schema}.{table} WHERE {window_pred}"
+    if where_clause:
+        sql += f" AND ({where_clause})"
+    cur.execute(sql, {'since': since})
+    keys = [tuple(row) for row in cur.fetchall()]
+    cur.close()
+    return keys
+
+
+def fetch_rows_by_pk(conn, schema, table, columns, primary_keys, pk_values_list, where_clause=None, lookup_size=500):
+    """
+    Fetches the rows for the given PK tuples using IN-list lookups of at most lookup_size keys.
+    Returns a list of rows (as tuples) and the column names.
+    """
+    col_str = ', '.join(columns)
+    rows = []
+    col_names = list(columns)
+    pk_values_list = list(pk_values_list)
+    cur = conn.cursor()
+    for start in range(0, len(pk_values_list), lookup_size):
+        chunk = pk_values_list[start:start + lookup_size]
+        binds = []
+        terms = []
+        for pk_values in chunk:
+            placeholders = []
+            for val in pk_values:
+                binds.append(val)
+                placeholders.append(f":{len(binds)}")
+            terms.append(f"({', '.join(placeholders)})")
+        sql = f"SELECT {col_str} FROM {schema}.{table} WHERE ({', '.join(primary_keys)}) IN ({', '.join(terms)})"
+        if where_clause:
+            sql += f" AND ({where_clause})"
+        cur.execute(sql, binds)
+        rows.extend(cur.fetchall())
+        col_names = [desc[0] for desc in cur.description]
+    cur.close()
+    return rows, col_names
+
+
+def fetch_column_types(conn, schema, table, columns):
+    """
+    Returns {column_name: data_type} from ALL_TAB_COLUMNS for the given columns (names compared in upper case).
+    """
+    cur = conn.cursor()
+    sql = "SELECT column_name, data_type FROM all_tab_columns WHERE owner = :owner AND table_name = :table_name"
+    cur.execute(sql, {'owner': schema.upper(), 'table_name': table.upper()})
+    types = dict(cur.fetchall())
+    cur.close()
+    return {col: types.get(col.upper()) for col in columns}
@@ -1,3 +1,5 @@
+from modules.row_hasher import hash_rows_by_pk
+
 def compare_hashes(source_hashes, target_hashes):
     """
     Compares two dicts of {pk: hash}. Returns:
@@ -17,4 +19,15 @@ def compare_hashes(source_hashes, target_hashes):
     for pk in target_hashes:
         if pk not in source_hashes:
             missing_in_source.append(pk)
-    return mismatches, missing_in_source, missing_in_target 
\ No newline at end of file
+    return mismatches, missing_in_source, missing_in_target 
+
+def compare_row_sets(source_rows, target_rows, col_names, exclude_columns=None):
+    """
+    Compares all rows collected for a table at once, as dicts of {pk: row}. Returns the same three lists as compare_hashes.
+    Use this rather than concatenating per-batch results: source and target are paged independently by OFFSET,
+    so one missing row shifts later batches and every batch boundary reports spurious missing keys on both sides.
+    """
+    return compare_hashes(
+        hash_rows_by_pk(source_rows, col_names, exclude_columns),
+        hash_rows_by_pk(target_rows, col_names, exclude_columns),
+    )
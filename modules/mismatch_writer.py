@@ -0,0 +1,161 @@
+import os
+import gzip
+import json
+from modules.row_hasher import hash_row
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow is in requirements.txt; fall back to gzip JSON lines if it is missing
+    pa = None
+    pq = None
+
+def _to_str(val):
+    return None if val is None else str(val)
+
+class MismatchWriter:
+    """
+    Writes mismatch/missing PKs, row digests and (optionally) differing column values to a compressed
+    columnar file, one row group per chunk. Writes Parquet if pyarrow is installed, otherwise gzip JSON lines.
+    The file is only created once the first drifted row is written. Not thread-safe; write from one thread.
+    """
+    def __init__(self, base_path, col_names, primary_keys, exclude_columns=None, include_values=False):
+        self.path = base_path + ('.parquet' if pa is not None else '.jsonl.gz')
+        self.col_names = list(col_names)
+        self.primary_keys = list(primary_keys)
+        self.exclude_columns = exclude_columns or []
+        self.include_values = include_values
+        self.hash_indices = [i for i, col in enumerate(self.col_names) if col not in self.exclude_columns]
+        self.fields = ['chunk_id', 'kind'] + self.primary_keys + ['source_hash', 'target_hash']
+        if include_values:
+            self.fields += ['diff_columns', 'source_values', 'target_values']
+        self.rows_written = 0
+        self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _record(self, chunk_id, kind, pk, source_row, target_row):
+        record = {
+            'chunk_id': chunk_id,
+            'kind': kind,
+            'source_hash': hash_row(source_row, self.hash_indices) if source_row is not None else None,
+            'target_hash': hash_row(target_row, self.hash_indices) if target_row is not None else None,
+        }
+        record.update({col: _to_str(val) for col, val in zip(self.primary_keys, pk)})
+        if self.include_values:
+            src = dict(zip(self.col_names, source_row)) if source_row is not None else {}
+            tgt = dict(zip(self.col_names, target_row)) if target_row is not None else {}
+            diff_cols = [
+                col for col in self.col_names
+                if col not in self.exclude_columns and _to_str(src.get(col)) != _to_str(tgt.get(col))
+            ]
+            record['diff_columns'] = ','.join(diff_cols)
+            record['source_values'] = json.dumps({col: _to_str(src[col]) for col in diff_cols if col in src}) if src else None
+            record['target_values'] = json.dumps({col: _to_str(tgt[col]) for col in diff_cols if col in tgt}) if tgt else None
+        return record
+
+    def write_all(self, mismatches, missing_in_source, missing_in_target, source_rows, target_rows, chunk_size=1000):
+        """
+        Writes the final drifted PKs for a table in chunks of chunk_size records.
+        The PK lists should come from a whole-table comparison (compare_row_sets) after reverification,
+        not from per-batch results.
+        source_rows/target_rows: dicts {pk: row} used for digests and differing column values.
+        """
+        drifted = (
+            [('MISMATCH', pk) for pk in mismatches]
+            + [('MISSING_IN_SOURCE', pk) for pk in missing_in_source]
+            + [('MISSING_IN_TARGET', pk) for pk in missing_in_target]
+        )
+        for chunk_id, start in enumerate(range(0, len(drifted), chunk_size)):
+            self.write_chunk(chunk_id, drifted[start:start + chunk_size], source_rows, target_rows)
+
+    def write_chunk(self, chunk_id, drifted, source_rows, target_rows):
+        """
+        Appends one chunk of (kind, pk) pairs as a single row group.
+        """
+        records = [
+            self._record(
+                chunk_id, kind, pk,
+                source_rows.get(pk) if kind != 'MISSING_IN_SOURCE' else None,
+                target_rows.get(pk) if kind != 'MISSING_IN_TARGET' else None,
+            )
+            for kind, pk in drifted
+        ]
+        if not records:
+            return
+        if pa is not None:
+            if self._writer is None:
+                schema = pa.schema([(f, pa.int64() if f == 'chunk_id' else pa.string()) for f in self.fields])
+                self._writer = pq.ParquetWriter(self.path, schema, compression='zstd')
+            columns = {f: [r.get(f) for r in records] for f in self.fields}
+            self._writer.write_table(pa.table(columns, schema=self._writer.schema))
+        else:
+            if self._writer is None:
+                self._writer = gzip.open(self.path, 'wt', encoding='utf-8')
+            for r in records:
+                self._writer.write(json.dumps({f: r.get(f) for f in self.fields}) + '\n')
+        self.rows_written += len(records)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+def _require_pyarrow(path):
+    if pq is None:
+        raise ImportError(f"pyarrow is required to read {path}; install it with 'pip install pyarrow'")
+
+def count_mismatch_rows(path):
+    """
+    Returns the number of records in a mismatch file. Parquet uses file metadata;
+    gzip JSON lines must be decompressed in full, so callers should cache the result.
+    """
+    if path.endswith('.parquet'):
+        _require_pyarrow(path)
+        return pq.ParquetFile(path).metadata.num_rows
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        return sum(1 for _ in f)
+
+def read_mismatch_page(path, page, page_size=1000):
+    """
+    Loads one page of a mismatch file as a pandas DataFrame. Parquet reads only the row groups it needs;
+    gzip JSON lines are read sequentially up to the requested page.
+    """
+    import pandas as pd
+    start = page * page_size
+    if path.endswith('.parquet'):
+        _require_pyarrow(path)
+        pf = pq.ParquetFile(path)
+        groups = []
+        group_start = 0
+        for i in range(pf.num_row_groups):
+            n = pf.metadata.row_group(i).num_rows
+            if group_start + n > start and group_start < start + page_size:
+                if not groups:
+                    first_start = group_start
+                groups.append(i)
+            group_start += n
+        if not groups:
+            return pd.DataFrame()
+        df = pf.read_row_groups(groups).to_pandas()
+        return df.iloc[start - first_start:start - first_start + page_size].reset_index(drop=True)
+    for i, chunk in enumerate(pd.read_json(path, lines=True, compression='gzip', chunksize=page_size, dtype=False)):
+        if i == page:
+            return chunk.reset_index(drop=True)
+    return pd.DataFrame()
+
+def list_mismatch_files(output_dir='./output'):
+    """
+    Lists mismatch files in output_dir, newest first.
+    """
+    if not os.path.isdir(output_dir):
+        return []
+    files = [
+        os.path.join(output_dir, name) for name in os.listdir(output_dir)
+        if name.startswith('mismatches_') and (name.endswith('.parquet') or name.endswith('.jsonl.gz'))
+    ]
+    return sorted(files, key=os.path.getmtime, reverse=True)
@@ -1,21 +1,37 @@
 import hashlib
 
-def hash_rows(rows, col_names, exclude_columns=None):
+def hash_row(row, col_indices):
+    """
+    SHA256 of the given column positions of one row, joined with '|' (NULL as empty string).
+    """
+    values = [str(row[i]) if row[i] is not None else '' for i in col_indices]
+    return hashlib.sha256('|'.join(values).encode('utf-8')).hexdigest()
+
+def hash_rows(rows, col_names, exclude_columns=None, primary_keys=None):
     """
     Hashes each row (excluding specified columns) using SHA256.
     Returns a dict: {primary_key_tuple: row_hash}
+    primary_keys: list of PK column names used to key the result. If omitted, the full row is used as the key.
     """
     if exclude_columns is None:
         exclude_columns = []
     col_indices = [i for i, col in enumerate(col_names) if col not in exclude_columns]
-    pk_indices = [i for i, col in enumerate(col_names) if col in exclude_columns or False]  # Placeholder, actual PK indices should be passed if needed
+    pk_indices = [col_names.index(col) for col in primary_keys] if primary_keys else []
     row_hashes = {}
     for row in rows:
         # Only hash non-excluded columns
-        values = [str(row[i]) if row[i] is not None else '' for i in col_indices]
-        row_str = '|'.join(values)
-        row_hash = hashlib.sha256(row_str.encode('utf-8')).hexdigest()
-        # Use all columns as PK if PK indices not provided (should be improved)
+        row_hash = hash_row(row, col_indices)
+        # Use all columns as PK if PK indices not provided
         pk = tuple(row[i] for i in pk_indices) if pk_indices else tuple(row[i] for i in range(len(row)))
         row_hashes[pk] = row_hash
-    return row_hashes 
\ No newline at end of file
+    return row_hashes
+
+def hash_rows_by_pk(rows_by_pk, col_names, exclude_columns=None):
+    """
+    Hashes rows already keyed by PK, as collected across batches.
+    rows_by_pk: dict {primary_key_tuple: row}. Returns a dict: {primary_key_tuple: row_hash}
+    """
+    if exclude_columns is None:
+        exclude_columns = []
+    col_indices = [i for i, col in enumerate(col_names) if col not in exclude_columns]
+    return {pk: hash_row(row, col_indices) for pk, row in rows_by_pk.items()}
@@ -0,0 +1,89 @@
+import math
+from statistics import NormalDist
+
+# ORA_HASH buckets used for the PK sample filter (0..SAMPLE_BUCKETS-1)
+SAMPLE_BUCKETS = 10000
+
+def effective_sample_percent(sample_percent):
+    """
+    Validates sample_percent and returns the percent actually selected once rounded to whole ORA_HASH buckets.
+    """
+    if not 0 < sample_percent <= 100:
+        raise ValueError(f"sample_percent must be in (0, 100], got {sample_percent}")
+    threshold = int(round(sample_percent / 100.0 * SAMPLE_BUCKETS))
+    if threshold < 1:
+        raise ValueError(f"sample_percent must be at least {100.0 / SAMPLE_BUCKETS}%, got {sample_percent}")
+    return threshold * 100.0 / SAMPLE_BUCKETS
+
+def canonical_key_expr(col, data_type=None):
+    """
+    Returns a SQL expression rendering a PK column as text independent of session NLS settings,
+    so both databases hash the same string for the same key.
+    """
+    data_type = (data_type or '').upper()
+    if data_type in ('NUMBER', 'FLOAT', 'INTEGER', 'BINARY_FLOAT', 'BINARY_DOUBLE'):
+        return f"TO_CHAR({col}, 'TM9', 'NLS_NUMERIC_CHARACTERS=''.,''')"
+    if data_type == 'DATE':
+        return f"TO_CHAR({col}, 'YYYY-MM-DD HH24:MI:SS')"
+    if data_type.startswith('TIMESTAMP') and 'TIME ZONE' in data_type:
+        return f"TO_CHAR(SYS_EXTRACT_UTC({col}), 'YYYY-MM-DD HH24:MI:SS.FF9')"
+    if data_type.startswith('TIMESTAMP'):
+        return f"TO_CHAR({col}, 'YYYY-MM-DD HH24:MI:SS.FF9')"
+    if data_type == 'RAW':
+        return f"RAWTOHEX({col})"
+    if data_type in ('VARCHAR2', 'NVARCHAR2', 'CHAR', 'NCHAR'):
+        # ORA_HASH hashes stored bytes; re-encode as UTF-8 hex so differing database character sets agree
+        return f"RAWTOHEX(UTL_I18N.STRING_TO_RAW({col}, 'AL32UTF8'))"
+    # Unknown type: fall back to the session's default conversion
+    return f"TO_CHAR({col})"
+
+def build_sample_filter(primary_keys, sample_percent, seed=0, pk_types=None):
+    """
+    Builds a deterministic WHERE predicate that selects sample_percent% of rows by hashing the PK.
+    The predicate only depends on PK values, so source and target select the identical set of keys.
+    pk_types: optional {column: data_type} used to render keys without relying on NLS settings.
+    """
+    pk_types = pk_types or {}
+    pk_expr = " || '|' || ".join([canonical_key_expr(col, pk_types.get(col)) for col in primary_keys])
+    threshold = int(round(effective_sample_percent(sample_percent) / 100.0 * SAMPLE_BUCKETS))
+    return f"ORA_HASH({pk_expr}, {SAMPLE_BUCKETS - 1}, {int(seed)}) < {threshold}"
+
+def combine_where(where_clause, extra_predicate):
+    """
+    ANDs an extra predicate onto an optional table where_clause.
+    """
+    if not extra_predicate:
+        return where_clause
+    if not where_clause:
+        return extra_predicate
+    return f"({where_clause}) AND ({extra_predicate})"
+
+def wilson_interval(successes, trials, confidence=0.95):
+    """
+    Wilson score interval for a binomial proportion.
+    Returns (rate, lower, upper); all 0.0 when trials is 0.
+    """
+    if trials <= 0:
+        return 0.0, 0.0, 0.0
+    z = NormalDist().inv_cdf(1 - (1 - confidence) / 2)
+    p = successes / trials
+    denom = 1 + z * z / trials
+    centre = (p + z * z / (2 * trials)) / denom
+    margin = z * math.sqrt(p * (1 - p) / trials + z * z / (4 * trials * trials)) / denom
+    return p, max(0.0, centre - margin), min(1.0, centre + margin)
+
+def estimate_drift(sampled_keys, drifted_keys, confidence=0.95):
+    """
+    Estimates the table-wide drift rate from a PK sample.
+    sampled_keys: number of distinct PKs seen on either side of the sample.
+    drifted_keys: number of those PKs that mismatched or were missing on one side.
+    Returns a dict suitable for merging into the comparison report.
+    """
+    rate, lower, upper = wilson_interval(drifted_keys, sampled_keys, confidence)
+    return {
+        'sampled_keys': sampled_keys,
+        'estimated_drift_rate': round(rate, 8),
+        'drift_ci_low': round(lower, 8),
+        'drift_ci_high': round(upper, 8),
+        'confidence': confidence,
+    }
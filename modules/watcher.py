@@ -0,0 +1,55 @@
+from modules.batch_fetcher import fetch_changed_keys, fetch_rows_by_pk
+from modules.row_hasher import hash_rows
+from modules.comparator import compare_hashes
+
+def compare_changed_rows(source_db, target_db, table_cfg, columns, since, carried_pks):
+    """
+    Compares rows changed on either side since the given low-water marks, plus PKs carried over from the previous cycle.
+    since: (source_since, target_since), each in that server's local time.
+    Changed keys are collected per side and then looked up on both sides, so a row updated on one side only
+    is compared rather than reported as missing.
+    Returns (checked_pks, drift) where drift is a dict {pk: 'MISMATCH' | 'MISSING_IN_SOURCE' | 'MISSING_IN_TARGET'}.
+    """
+    schema = table_cfg['schema']
+    table = table_cfg['table_name']
+    primary_keys = table_cfg['primary_key']
+    where_clause = table_cfg.get('where_clause')
+    watermark_column = table_cfg.get('watermark_column')
+    exclude_columns = table_cfg.get('exclude_columns', [])
+
+    checked_pks = set(carried_pks)
+    checked_pks.update(fetch_changed_keys(source_db.conn, schema, table, primary_keys, where_clause, since[0], watermark_column))
+    checked_pks.update(fetch_changed_keys(target_db.conn, schema, table, primary_keys, where_clause, since[1], watermark_column))
+    if not checked_pks:
+        return checked_pks, {}
+
+    src_rows, col_names = fetch_rows_by_pk(source_db.conn, schema, table, columns, primary_keys, checked_pks, where_clause)
+    tgt_rows, _ = fetch_rows_by_pk(target_db.conn, schema, table, columns, primary_keys, checked_pks, where_clause)
+    src_hashes = hash_rows(src_rows, col_names, exclude_columns, primary_keys)
+    tgt_hashes = hash_rows(tgt_rows, col_names, exclude_columns, primary_keys)
+    mismatches, missing_in_source, missing_in_target = compare_hashes(src_hashes, tgt_hashes)
+
+    drift = {}
+    drift.update({pk: 'MISMATCH' for pk in mismatches})
+    drift.update({pk: 'MISSING_IN_SOURCE' for pk in missing_in_source})
+    drift.update({pk: 'MISSING_IN_TARGET' for pk in missing_in_target})
+    return checked_pks, drift
+
+def carry_forward(pending, reported, drift, checked_pks, confirm_cycles=2):
+    """
+    Updates the carried-forward drift state after a cycle.
+    pending: dict {pk: consecutive cycles the PK has drifted}, from the previous cycle.
+    reported: set of PKs already reported as confirmed.
+    A PK is confirmed once it has drifted for confirm_cycles consecutive cycles. Confirmed PKs are reported once
+    and moved out of the pending set, so they are not re-fetched every cycle; if one is seen again in a later
+    window it is not reported again until it has been seen in sync.
+    PKs that no longer drift are resolved (typically in-flight replication that has since caught up).
+    Returns (new_pending, new_reported, confirmed, resolved).
+    """
+    seen = {pk: pending.get(pk, 0) + 1 for pk in drift if pk not in reported}
+    confirmed = {pk: drift[pk] for pk, count in seen.items() if count >= confirm_cycles}
+    new_pending = {pk: count for pk, count in seen.items() if pk not in confirmed}
+    back_in_sync = {pk for pk in reported if pk in checked_pks and pk not in drift}
+    new_reported = (set(reported) - back_in_sync) | set(confirmed)
+    resolved = (set(pending) - set(drift)) | back_in_sync
+    return new_pending, new_reported, confirmed, resolved
@@ -7,6 +7,7 @@ import pandas as pd
 from db_sentinel import main as run_db_sentinel
 from modules.config_loader import load_config
 from modules.db_connector import OracleDBConnector
+from modules.mismatch_writer import list_mismatch_files, count_mismatch_rows, read_mismatch_page
 
 def get_audit_records(conn, audit_table, limit=20):
     cur = conn.get_cursor()
@@ -24,6 +25,15 @@ def get_metadata_records(conn, metadata_table, limit=20):
     cur.close()
     return pd.DataFrame(rows, columns=col_names)
 
+@st.cache_data
+def cached_mismatch_row_count(path, mtime):
+    # mtime is part of the cache key so a rewritten file is recounted
+    return count_mismatch_rows(path)
+
+@st.cache_data
+def cached_mismatch_page(path, mtime, page, page_size):
+    return read_mismatch_page(path, page, page_size)
+
 st.set_page_config(page_title="DB Sentinel UI", layout="wide")
 st.title("DB Sentinel - Oracle Table Comparison Utility")
 
@@ -67,6 +77,8 @@ st.header("Flags")
 config['flags']['enable_audit_table'] = st.checkbox("Enable Audit Table", config['flags'].get('enable_audit_table', True))
 config['flags']['enable_reverification'] = st.checkbox("Enable Reverification", config['flags'].get('enable_reverification', True))
 config['flags']['enable_restart'] = st.checkbox("Enable Restart", config['flags'].get('enable_restart', True))
+config['flags']['enable_columnar_output'] = st.checkbox("Write Columnar Mismatch Files", config['flags'].get('enable_columnar_output', False))
+config['flags']['columnar_include_values'] = st.checkbox("Include Differing Column Values", config['flags'].get('columnar_include_values', False))
 
 # Editable table configs with Add/Delete functionality using session state
 st.header("Table Configs")
@@ -145,6 +157,18 @@ with OracleDBConnector(config['source_db']) as conn:
     st.subheader("Recent Metadata Records")
     st.dataframe(get_metadata_records(conn, config['paths'].get('metadata_table', 'DB_SENTINEL_METADATA')))
 
+# Page through columnar mismatch files without loading them fully
+mismatch_files = list_mismatch_files('./output')
+if mismatch_files:
+    st.subheader("Mismatch Records")
+    mismatch_path = st.selectbox("Mismatch File", mismatch_files, format_func=os.path.basename)
+    page_size = st.number_input("Rows per Page", value=1000, min_value=10, step=100)
+    mismatch_mtime = os.path.getmtime(mismatch_path)
+    total_records = cached_mismatch_row_count(mismatch_path, mismatch_mtime)
+    n_pages = max(1, (total_records + page_size - 1) // page_size)
+    page = st.number_input(f"Page (1-{n_pages}, {total_records} records)", value=1, min_value=1, max_value=n_pages)
+    st.dataframe(cached_mismatch_page(mismatch_path, mismatch_mtime, page - 1, page_size))
+
 # Download links for logs/output
 st.subheader("Output Files")
 if os.path.exists(config['paths']['audit_log']):